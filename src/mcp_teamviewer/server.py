@@ -4,29 +4,47 @@ Exposes TeamViewer Web API (https://webapi.teamviewer.com/api/v1) as MCP tools.
 Authentication: Bearer token (Script Token or OAuth 2.0 access token).
 """
 
+import asyncio
+import functools
 import json
 import os
+import time
+from collections.abc import Awaitable, Callable
 from pathlib import Path
 from typing import Any
-
-from dotenv import load_dotenv
-
-# Load .env from the project root (two levels up from this file)
-load_dotenv(Path(__file__).parent.parent.parent / ".env")
+from urllib.parse import urlsplit
+from urllib.request import getproxies_environment, proxy_bypass_environment
 
 import httpx
 import mcp.server.stdio
 import mcp.types as types
+from dotenv import load_dotenv
 from mcp.server import NotificationOptions, Server
 from mcp.server.models import InitializationOptions
 
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "speedups" extra
+    orjson = None
+
 BASE_URL = "https://webapi.teamviewer.com/api/v1"
 
 server = Server("mcp-teamviewer")
 
 
+@functools.lru_cache(maxsize=1)
+def _load_env_once() -> None:
+    # .env in the project root (two levels up from this file). Only read when
+    # a setting is missing from the environment; existing variables win.
+    load_dotenv(Path(__file__).resolve().parents[2] / ".env")
+
+
+@functools.lru_cache(maxsize=1)
 def get_token() -> str:
     token = os.environ.get("TEAMVIEWER_API_TOKEN", "")
+    if not token:
+        _load_env_once()
+        token = os.environ.get("TEAMVIEWER_API_TOKEN", "")
     if not token:
         raise ValueError(
             "TEAMVIEWER_API_TOKEN environment variable is not set. "
@@ -36,6 +54,20 @@ def get_token() -> str:
     return token
 
 
+@functools.lru_cache(maxsize=1)
+def parse_write_responses() -> bool:
+    """Whether update/delete/close tools return the API's response body.
+
+    Set TEAMVIEWER_SKIP_WRITE_RESPONSES=1 to report only the status instead.
+    """
+    value = os.environ.get("TEAMVIEWER_SKIP_WRITE_RESPONSES")
+    if value is None:
+        _load_env_once()
+        value = os.environ.get("TEAMVIEWER_SKIP_WRITE_RESPONSES", "")
+    return value.lower() not in ("1", "true", "yes")
+
+
+@functools.lru_cache(maxsize=1)
 def build_headers() -> dict[str, str]:
     return {
         "Authorization": f"Bearer {get_token()}",
@@ -43,69 +75,164 @@ def build_headers() -> dict[str, str]:
     }
 
 
-async def tv_get(path: str, params: dict | None = None) -> Any:
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{BASE_URL}{path}",
-            headers=build_headers(),
-            params=params,
+_CLIENT: httpx.AsyncClient | None = None
+
+
+def _env_proxy() -> str | None:
+    """Proxy URL for BASE_URL from HTTPS_PROXY/ALL_PROXY, honouring NO_PROXY.
+
+    httpx only reads proxy settings from the environment when no transport
+    is given, so the retrying transport has to be told explicitly. Like
+    httpx, only environment variables are consulted, not OS proxy settings.
+    """
+    proxies = getproxies_environment()
+    if not proxies:
+        _load_env_once()
+        proxies = getproxies_environment()
+    host = urlsplit(BASE_URL).hostname
+    if proxy_bypass_environment(host):
+        return None
+    return proxies.get("https") or proxies.get("all")
+
+
+async def get_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it on first use.
+
+    A single client keeps connections to the TeamViewer API alive across
+    tool calls instead of paying a new TCP + TLS handshake every time, and
+    HTTP/2 lets concurrent tool calls share one connection. Failed connection
+    attempts are retried by the transport; HTTP error responses are not.
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        # Headers first: a missing token loads .env, which may also set the proxy.
+        headers = build_headers()
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            retries=2,
+            proxy=_env_proxy(),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+        _CLIENT = httpx.AsyncClient(
+            base_url=BASE_URL,
+            headers=headers,
             timeout=30.0,
+            transport=transport,
         )
-        response.raise_for_status()
-        return response.json()
+    return _CLIENT
 
 
-async def tv_post(path: str, body: dict | None = None) -> Any:
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{BASE_URL}{path}",
-            headers=build_headers(),
-            json=body or {},
-            timeout=30.0,
-        )
-        response.raise_for_status()
-        return response.json()
+async def close_client() -> None:
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
 
 
-async def tv_put(path: str, body: dict | None = None) -> Any:
-    async with httpx.AsyncClient() as client:
-        response = await client.put(
-            f"{BASE_URL}{path}",
-            headers=build_headers(),
-            json=body or {},
-            timeout=30.0,
-        )
-        response.raise_for_status()
-        return response.json()
+async def tv_request(
+    method: str,
+    path: str,
+    *,
+    params: dict | None = None,
+    json_body: dict | None = None,
+    parse: bool = True,
+) -> Any:
+    """Call the TeamViewer API and return the decoded JSON response.
 
+    With ``parse=False`` the body is not decoded and only the status is
+    reported, for writes whose response the caller doesn't need.
+    """
+    client = await get_client()
+    response = await client.request(method, path, params=params, json=json_body)
+    if method != "GET":
+        invalidate_cache(path)
+    response.raise_for_status()
+    if not parse:
+        return {"success": True, "status": response.status_code}
+    if response.status_code == 204:
+        return {"success": True}
+    return response.json()
+
+
+async def tv_get_many(paths: list[str]) -> list[Any]:
+    """GET several paths concurrently over the shared client."""
+    return await asyncio.gather(*(tv_request("GET", path) for path in paths))
+
+
+# Short-lived cache for read-only lookups that agents tend to repeat within a
+# session. Keyed by (path, params); any write under the same top-level
+# resource (e.g. "/groups") drops the related entries and bumps that
+# resource's generation, so a read that was in flight during the write
+# doesn't store its now-stale result.
+CACHE_TTL = 5.0
+_CACHE: dict[tuple[str, frozenset | None], tuple[float, Any]] = {}
+_GENERATIONS: dict[str, int] = {}
 
-async def tv_delete(path: str) -> Any:
-    async with httpx.AsyncClient() as client:
-        response = await client.delete(
-            f"{BASE_URL}{path}",
-            headers=build_headers(),
-            timeout=30.0,
-        )
-        response.raise_for_status()
-        if response.status_code == 204:
-            return {"success": True}
-        return response.json()
+
+def _resource_root(path: str) -> str:
+    return "/" + path.lstrip("/").split("/", 1)[0]
+
+
+def invalidate_cache(path: str) -> None:
+    root = _resource_root(path)
+    _GENERATIONS[root] = _GENERATIONS.get(root, 0) + 1
+    for key in [key for key in _CACHE if _resource_root(key[0]) == root]:
+        del _CACHE[key]
+
+
+def _sweep_cache(now: float, ttl: float) -> None:
+    # Keys include agent-supplied filters and IDs, so drop anything expired
+    # to keep the cache bounded by what was read within the last ttl.
+    for key in [key for key, (stored, _) in _CACHE.items() if now - stored >= ttl]:
+        del _CACHE[key]
+
+
+async def tv_get_cached(path: str, params: dict | None = None, ttl: float = CACHE_TTL) -> Any:
+    key = (path, frozenset(params.items()) if params else None)
+    now = time.monotonic()
+    cached = _CACHE.get(key)
+    if cached is not None and now - cached[0] < ttl:
+        return cached[1]
+    root = _resource_root(path)
+    generation = _GENERATIONS.get(root, 0)
+    data = await tv_request("GET", path, params=params)
+    if _GENERATIONS.get(root, 0) == generation:
+        _sweep_cache(time.monotonic(), ttl)
+        _CACHE[key] = (now, data)
+    return data
+
+
+def to_json(data: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
+
+# Maximum number of bytes of an API error body included in the tool result.
+ERROR_DETAIL_LIMIT = 4096
 
 
 def ok(data: Any) -> list[types.TextContent]:
-    return [types.TextContent(type="text", text=json.dumps(data, indent=2))]
+    return [types.TextContent(type="text", text=to_json(data))]
 
 
 # ---------------------------------------------------------------------------
 # Tool definitions
 # ---------------------------------------------------------------------------
 
+_EMPTY_SCHEMA: dict[str, Any] = {"type": "object", "properties": {}, "required": []}
+
+
+def _str_prop(description: str) -> dict[str, str]:
+    return {"type": "string", "description": description}
+
+
 TOOLS = [
     # ── Account ─────────────────────────────────────────────────────────────
     types.Tool(
         name="get_account",
         description="Get the current TeamViewer account information (email, name, company, etc.).",
-        inputSchema={"type": "object", "properties": {}, "required": []},
+        inputSchema=_EMPTY_SCHEMA,
     ),
     types.Tool(
         name="update_account",
@@ -113,11 +240,11 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "email": {"type": "string", "description": "New email address"},
-                "name": {"type": "string", "description": "Display name"},
-                "company": {"type": "string", "description": "Company name"},
-                "password": {"type": "string", "description": "New password"},
-                "old_password": {"type": "string", "description": "Current password (required when changing password)"},
+                "email": _str_prop("New email address"),
+                "name": _str_prop("Display name"),
+                "company": _str_prop("Company name"),
+                "password": _str_prop("New password"),
+                "old_password": _str_prop("Current password (required when changing password)"),
             },
             "required": [],
         },
@@ -132,7 +259,7 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "groupid": {"type": "string", "description": "Filter by group ID"},
+                "groupid": _str_prop("Filter by group ID"),
                 "online_state": {
                     "type": "string",
                     "enum": ["Online", "Busy", "Away", "Offline"],
@@ -149,7 +276,7 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "device_id": {"type": "string", "description": "The device ID (e.g. d123456789)"},
+                "device_id": _str_prop("The device ID (e.g. d123456789)"),
             },
             "required": ["device_id"],
         },
@@ -160,11 +287,11 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "device_id": {"type": "string", "description": "Device ID"},
-                "alias": {"type": "string", "description": "New alias/display name"},
-                "description": {"type": "string", "description": "Description"},
-                "password": {"type": "string", "description": "Remote control password"},
-                "groupid": {"type": "string", "description": "Target group ID to move the device"},
+                "device_id": _str_prop("Device ID"),
+                "alias": _str_prop("New alias/display name"),
+                "description": _str_prop("Description"),
+                "password": _str_prop("Remote control password"),
+                "groupid": _str_prop("Target group ID to move the device"),
             },
             "required": ["device_id"],
         },
@@ -175,7 +302,7 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "device_id": {"type": "string", "description": "Device ID to remove"},
+                "device_id": _str_prop("Device ID to remove"),
             },
             "required": ["device_id"],
         },
@@ -187,7 +314,7 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "name": {"type": "string", "description": "Filter groups by name (partial match)"},
+                "name": _str_prop("Filter groups by name (partial match)"),
             },
             "required": [],
         },
@@ -198,8 +325,8 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "name": {"type": "string", "description": "Group name"},
-                "policy_id": {"type": "string", "description": "Policy ID to assign to the group"},
+                "name": _str_prop("Group name"),
+                "policy_id": _str_prop("Policy ID to assign to the group"),
             },
             "required": ["name"],
         },
@@ -210,9 +337,9 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "group_id": {"type": "string", "description": "Group ID"},
-                "name": {"type": "string", "description": "New group name"},
-                "policy_id": {"type": "string", "description": "New policy ID"},
+                "group_id": _str_prop("Group ID"),
+                "name": _str_prop("New group name"),
+                "policy_id": _str_prop("New policy ID"),
             },
             "required": ["group_id"],
         },
@@ -223,7 +350,7 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "group_id": {"type": "string", "description": "Group ID to delete"},
+                "group_id": _str_prop("Group ID to delete"),
             },
             "required": ["group_id"],
         },
@@ -234,7 +361,7 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "group_id": {"type": "string", "description": "Group ID to share"},
+                "group_id": _str_prop("Group ID to share"),
                 "users": {
                     "type": "array",
                     "description": "List of user objects to share with",
@@ -258,9 +385,9 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "name": {"type": "string", "description": "Filter by name"},
-                "email": {"type": "string", "description": "Filter by email"},
-                "permissions": {"type": "string", "description": "Filter by permission level"},
+                "name": _str_prop("Filter by name"),
+                "email": _str_prop("Filter by email"),
+                "permissions": _str_prop("Filter by permission level"),
                 "full_list": {"type": "boolean", "description": "Return full user details"},
             },
             "required": [],
@@ -272,14 +399,11 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "email": {"type": "string", "description": "User email address"},
-                "name": {"type": "string", "description": "User display name"},
-                "password": {"type": "string", "description": "Initial password"},
-                "permissions": {
-                    "type": "string",
-                    "description": "Permission level (e.g. Administrator, User)",
-                },
-                "language": {"type": "string", "description": "Language code (e.g. en, de)"},
+                "email": _str_prop("User email address"),
+                "name": _str_prop("User display name"),
+                "password": _str_prop("Initial password"),
+                "permissions": _str_prop("Permission level (e.g. Administrator, User)"),
+                "language": _str_prop("Language code (e.g. en, de)"),
             },
             "required": ["email", "name", "password"],
         },
@@ -290,7 +414,7 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "user_id": {"type": "string", "description": "User ID (e.g. u123456)"},
+                "user_id": _str_prop("User ID (e.g. u123456)"),
             },
             "required": ["user_id"],
         },
@@ -301,10 +425,10 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "user_id": {"type": "string", "description": "User ID"},
-                "email": {"type": "string", "description": "New email"},
-                "name": {"type": "string", "description": "New display name"},
-                "permissions": {"type": "string", "description": "New permission level"},
+                "user_id": _str_prop("User ID"),
+                "email": _str_prop("New email"),
+                "name": _str_prop("New display name"),
+                "permissions": _str_prop("New permission level"),
                 "active": {"type": "boolean", "description": "Whether the account is active"},
             },
             "required": ["user_id"],
@@ -317,7 +441,7 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "groupid": {"type": "string", "description": "Filter by group ID"},
+                "groupid": _str_prop("Filter by group ID"),
                 "state": {
                     "type": "string",
                     "enum": ["open", "closed"],
@@ -333,9 +457,9 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "groupid": {"type": "string", "description": "Group ID for the session"},
-                "description": {"type": "string", "description": "Session description"},
-                "custom_internal_id": {"type": "string", "description": "Custom reference ID"},
+                "groupid": _str_prop("Group ID for the session"),
+                "description": _str_prop("Session description"),
+                "custom_internal_id": _str_prop("Custom reference ID"),
             },
             "required": ["groupid"],
         },
@@ -346,7 +470,7 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "session_code": {"type": "string", "description": "Session code (e.g. s00-000-000)"},
+                "session_code": _str_prop("Session code (e.g. s00-000-000)"),
             },
             "required": ["session_code"],
         },
@@ -357,9 +481,9 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "session_code": {"type": "string", "description": "Session code"},
-                "description": {"type": "string", "description": "New description"},
-                "custom_internal_id": {"type": "string", "description": "New custom reference ID"},
+                "session_code": _str_prop("Session code"),
+                "description": _str_prop("New description"),
+                "custom_internal_id": _str_prop("New custom reference ID"),
             },
             "required": ["session_code"],
         },
@@ -370,7 +494,7 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "session_code": {"type": "string", "description": "Session code to close"},
+                "session_code": _str_prop("Session code to close"),
             },
             "required": ["session_code"],
         },
@@ -385,17 +509,11 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "from_date": {
-                    "type": "string",
-                    "description": "Start date in ISO 8601 format (e.g. 2024-01-01T00:00:00)",
-                },
-                "to_date": {
-                    "type": "string",
-                    "description": "End date in ISO 8601 format",
-                },
-                "device_id": {"type": "string", "description": "Filter by device ID"},
-                "user_id": {"type": "string", "description": "Filter by user ID"},
-                "session_code": {"type": "string", "description": "Filter by session code"},
+                "from_date": _str_prop("Start date in ISO 8601 format (e.g. 2024-01-01T00:00:00)"),
+                "to_date": _str_prop("End date in ISO 8601 format"),
+                "device_id": _str_prop("Filter by device ID"),
+                "user_id": _str_prop("Filter by user ID"),
+                "session_code": _str_prop("Filter by session code"),
                 "limit": {
                     "type": "integer",
                     "description": "Maximum number of records to return",
@@ -414,11 +532,7 @@ TOOLS = [
     types.Tool(
         name="list_meetings",
         description="List all scheduled meetings in the account.",
-        inputSchema={
-            "type": "object",
-            "properties": {},
-            "required": [],
-        },
+        inputSchema=_EMPTY_SCHEMA,
     ),
     types.Tool(
         name="create_meeting",
@@ -426,16 +540,10 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "subject": {"type": "string", "description": "Meeting subject/title"},
-                "start": {
-                    "type": "string",
-                    "description": "Start time in ISO 8601 format (e.g. 2024-06-01T10:00:00)",
-                },
-                "end": {
-                    "type": "string",
-                    "description": "End time in ISO 8601 format",
-                },
-                "password": {"type": "string", "description": "Optional meeting password"},
+                "subject": _str_prop("Meeting subject/title"),
+                "start": _str_prop("Start time in ISO 8601 format (e.g. 2024-06-01T10:00:00)"),
+                "end": _str_prop("End time in ISO 8601 format"),
+                "password": _str_prop("Optional meeting password"),
             },
             "required": ["subject", "start", "end"],
         },
@@ -446,7 +554,7 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "meeting_id": {"type": "string", "description": "Meeting ID"},
+                "meeting_id": _str_prop("Meeting ID"),
             },
             "required": ["meeting_id"],
         },
@@ -457,11 +565,11 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "meeting_id": {"type": "string", "description": "Meeting ID"},
-                "subject": {"type": "string", "description": "New subject"},
-                "start": {"type": "string", "description": "New start time (ISO 8601)"},
-                "end": {"type": "string", "description": "New end time (ISO 8601)"},
-                "password": {"type": "string", "description": "New meeting password"},
+                "meeting_id": _str_prop("Meeting ID"),
+                "subject": _str_prop("New subject"),
+                "start": _str_prop("New start time (ISO 8601)"),
+                "end": _str_prop("New end time (ISO 8601)"),
+                "password": _str_prop("New meeting password"),
             },
             "required": ["meeting_id"],
         },
@@ -472,7 +580,7 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "meeting_id": {"type": "string", "description": "Meeting ID to delete"},
+                "meeting_id": _str_prop("Meeting ID to delete"),
             },
             "required": ["meeting_id"],
         },
@@ -481,11 +589,7 @@ TOOLS = [
     types.Tool(
         name="list_policies",
         description="List all TeamViewer policies defined in the Management Console.",
-        inputSchema={
-            "type": "object",
-            "properties": {},
-            "required": [],
-        },
+        inputSchema=_EMPTY_SCHEMA,
     ),
     types.Tool(
         name="get_policy",
@@ -493,7 +597,7 @@ TOOLS = [
         inputSchema={
             "type": "object",
             "properties": {
-                "policy_id": {"type": "string", "description": "Policy ID"},
+                "policy_id": _str_prop("Policy ID"),
             },
             "required": ["policy_id"],
         },
@@ -502,11 +606,177 @@ TOOLS = [
     types.Tool(
         name="ping",
         description="Verify the API token is valid and the TeamViewer API is reachable.",
-        inputSchema={"type": "object", "properties": {}, "required": []},
+        inputSchema=_EMPTY_SCHEMA,
     ),
 ]
 
 
+# ---------------------------------------------------------------------------
+# Tool handlers
+# ---------------------------------------------------------------------------
+
+def _non_null(args: dict[str, Any]) -> dict[str, Any]:
+    return {k: v for k, v in args.items() if v is not None}
+
+
+def payload_without(args: dict[str, Any], id_key: str) -> dict[str, Any]:
+    """Return the non-null arguments other than the resource ID."""
+    return {k: v for k, v in args.items() if k != id_key and v is not None}
+
+
+def project(args: dict[str, Any], fields: tuple[tuple[str, str], ...]) -> dict[str, Any]:
+    """Map tool arguments to API field names, dropping unset ones."""
+    return {param: args[arg] for arg, param in fields if args.get(arg) is not None}
+
+
+# (tool argument, API field) pairs per tool.
+_DEVICE_LIST_FIELDS = (("groupid", "groupid"), ("online_state", "online_state"))
+_GROUP_LIST_FIELDS = (("name", "name"),)
+_GROUP_CREATE_FIELDS = (("name", "name"), ("policy_id", "policy_id"))
+_USER_LIST_FIELDS = (("name", "name"), ("email", "email"), ("permissions", "permissions"))
+_SESSION_LIST_FIELDS = (("groupid", "groupid"), ("state", "state"))
+_REPORT_FIELDS = (
+    ("from_date", "from"),
+    ("to_date", "to"),
+    ("device_id", "deviceid"),
+    ("user_id", "userid"),
+    ("session_code", "sessioncode"),
+    ("limit", "limit"),
+    ("offset", "offset"),
+)
+
+
+# Resource paths, filled from the tool arguments.
+_DEVICE_PATH = "/devices/{device_id}".format_map
+_GROUP_PATH = "/groups/{group_id}".format_map
+_GROUP_SHARE_PATH = "/groups/{group_id}/share_group".format_map
+_USER_PATH = "/users/{user_id}".format_map
+_SESSION_PATH = "/sessions/{session_code}".format_map
+_MEETING_PATH = "/meetings/{meeting_id}".format_map
+_POLICY_PATH = "/teamviewerpolicies/{policy_id}".format_map
+
+
+async def list_devices(args: dict[str, Any]) -> Any:
+    params = project(args, _DEVICE_LIST_FIELDS)
+    if args.get("full_list"):
+        params["full_list"] = "true"
+    return await tv_request("GET", "/devices", params=params or None)
+
+
+async def update_device(args: dict[str, Any]) -> Any:
+    return await tv_request(
+        "PUT",
+        _DEVICE_PATH(args),
+        json_body=payload_without(args, "device_id"),
+        parse=parse_write_responses(),
+    )
+
+
+async def update_group(args: dict[str, Any]) -> Any:
+    return await tv_request(
+        "PUT",
+        _GROUP_PATH(args),
+        json_body=payload_without(args, "group_id"),
+        parse=parse_write_responses(),
+    )
+
+
+async def list_users(args: dict[str, Any]) -> Any:
+    params = project(args, _USER_LIST_FIELDS)
+    if args.get("full_list"):
+        params["full_list"] = "true"
+    return await tv_request("GET", "/users", params=params or None)
+
+
+async def update_user(args: dict[str, Any]) -> Any:
+    return await tv_request(
+        "PUT",
+        _USER_PATH(args),
+        json_body=payload_without(args, "user_id"),
+        parse=parse_write_responses(),
+    )
+
+
+async def update_session(args: dict[str, Any]) -> Any:
+    return await tv_request(
+        "PUT",
+        _SESSION_PATH(args),
+        json_body=payload_without(args, "session_code"),
+        parse=parse_write_responses(),
+    )
+
+
+async def update_meeting(args: dict[str, Any]) -> Any:
+    return await tv_request(
+        "PUT",
+        _MEETING_PATH(args),
+        json_body=payload_without(args, "meeting_id"),
+        parse=parse_write_responses(),
+    )
+
+
+# Tool name -> coroutine function taking the tool arguments and returning the
+# decoded API response.
+HANDLERS: dict[str, Callable[[dict[str, Any]], Awaitable[Any]]] = {
+    # ── Ping ────────────────────────────────────────────────────────────────
+    "ping": lambda a: tv_get_cached("/ping"),
+    # ── Account ─────────────────────────────────────────────────────────────
+    "get_account": lambda a: tv_get_cached("/account"),
+    "update_account": lambda a: tv_request(
+        "PUT", "/account", json_body=_non_null(a), parse=parse_write_responses()
+    ),
+    # ── Devices ─────────────────────────────────────────────────────────────
+    "list_devices": list_devices,
+    "get_device": lambda a: tv_request("GET", _DEVICE_PATH(a)),
+    "update_device": update_device,
+    "delete_device": lambda a: tv_request(
+        "DELETE", _DEVICE_PATH(a), parse=parse_write_responses()
+    ),
+    # ── Groups ──────────────────────────────────────────────────────────────
+    "list_groups": lambda a: tv_get_cached("/groups", project(a, _GROUP_LIST_FIELDS) or None),
+    "create_group": lambda a: tv_request(
+        "POST", "/groups", json_body=project(a, _GROUP_CREATE_FIELDS)
+    ),
+    "update_group": update_group,
+    "delete_group": lambda a: tv_request(
+        "DELETE", _GROUP_PATH(a), parse=parse_write_responses()
+    ),
+    "share_group": lambda a: tv_request(
+        "POST", _GROUP_SHARE_PATH(a), json_body={"users": a["users"]}
+    ),
+    # ── Users ───────────────────────────────────────────────────────────────
+    "list_users": list_users,
+    "create_user": lambda a: tv_request("POST", "/users", json_body=_non_null(a)),
+    "get_user": lambda a: tv_request("GET", _USER_PATH(a)),
+    "update_user": update_user,
+    # ── Sessions ────────────────────────────────────────────────────────────
+    "list_sessions": lambda a: tv_request(
+        "GET", "/sessions", params=project(a, _SESSION_LIST_FIELDS) or None
+    ),
+    "create_session": lambda a: tv_request("POST", "/sessions", json_body=_non_null(a)),
+    "get_session": lambda a: tv_request("GET", _SESSION_PATH(a)),
+    "update_session": update_session,
+    "close_session": lambda a: tv_request(
+        "PUT", _SESSION_PATH(a), json_body={"state": "closed"}, parse=parse_write_responses()
+    ),
+    # ── Connection Reports ──────────────────────────────────────────────────
+    "get_connection_reports": lambda a: tv_request(
+        "GET", "/reports/connections", params=project(a, _REPORT_FIELDS) or None
+    ),
+    # ── Meetings ────────────────────────────────────────────────────────────
+    "list_meetings": lambda a: tv_request("GET", "/meetings"),
+    "create_meeting": lambda a: tv_request("POST", "/meetings", json_body=_non_null(a)),
+    "get_meeting": lambda a: tv_request("GET", _MEETING_PATH(a)),
+    "update_meeting": update_meeting,
+    "delete_meeting": lambda a: tv_request(
+        "DELETE", _MEETING_PATH(a), parse=parse_write_responses()
+    ),
+    # ── Policies ────────────────────────────────────────────────────────────
+    "list_policies": lambda a: tv_get_cached("/teamviewerpolicies"),
+    "get_policy": lambda a: tv_get_cached(_POLICY_PATH(a)),
+}
+
+
 # ---------------------------------------------------------------------------
 # Handler registration
 # ---------------------------------------------------------------------------
@@ -522,207 +792,32 @@ async def handle_call_tool(
 ) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
     args = arguments or {}
 
-    try:
-        # ── Ping ────────────────────────────────────────────────────────────
-        if name == "ping":
-            data = await tv_get("/ping")
-            return ok(data)
-
-        # ── Account ─────────────────────────────────────────────────────────
-        elif name == "get_account":
-            data = await tv_get("/account")
-            return ok(data)
-
-        elif name == "update_account":
-            payload = {k: v for k, v in args.items() if v is not None}
-            data = await tv_put("/account", payload)
-            return ok(data)
-
-        # ── Devices ─────────────────────────────────────────────────────────
-        elif name == "list_devices":
-            params: dict[str, Any] = {}
-            if args.get("groupid"):
-                params["groupid"] = args["groupid"]
-            if args.get("online_state"):
-                params["online_state"] = args["online_state"]
-            if args.get("full_list"):
-                params["full_list"] = "true"
-            data = await tv_get("/devices", params or None)
-            return ok(data)
-
-        elif name == "get_device":
-            data = await tv_get(f"/devices/{args['device_id']}")
-            return ok(data)
-
-        elif name == "update_device":
-            device_id = args.pop("device_id")
-            payload = {k: v for k, v in args.items() if v is not None}
-            data = await tv_put(f"/devices/{device_id}", payload)
-            return ok(data)
-
-        elif name == "delete_device":
-            data = await tv_delete(f"/devices/{args['device_id']}")
-            return ok(data)
-
-        # ── Groups ──────────────────────────────────────────────────────────
-        elif name == "list_groups":
-            params = {}
-            if args.get("name"):
-                params["name"] = args["name"]
-            data = await tv_get("/groups", params or None)
-            return ok(data)
-
-        elif name == "create_group":
-            payload: dict[str, Any] = {"name": args["name"]}
-            if args.get("policy_id"):
-                payload["policy_id"] = args["policy_id"]
-            data = await tv_post("/groups", payload)
-            return ok(data)
-
-        elif name == "update_group":
-            group_id = args.pop("group_id")
-            payload = {k: v for k, v in args.items() if v is not None}
-            data = await tv_put(f"/groups/{group_id}", payload)
-            return ok(data)
-
-        elif name == "delete_group":
-            data = await tv_delete(f"/groups/{args['group_id']}")
-            return ok(data)
-
-        elif name == "share_group":
-            group_id = args["group_id"]
-            payload = {"users": args["users"]}
-            data = await tv_post(f"/groups/{group_id}/share_group", payload)
-            return ok(data)
-
-        # ── Users ────────────────────────────────────────────────────────────
-        elif name == "list_users":
-            params = {}
-            for field in ("name", "email", "permissions"):
-                if args.get(field):
-                    params[field] = args[field]
-            if args.get("full_list"):
-                params["full_list"] = "true"
-            data = await tv_get("/users", params or None)
-            return ok(data)
-
-        elif name == "create_user":
-            payload = {k: v for k, v in args.items() if v is not None}
-            data = await tv_post("/users", payload)
-            return ok(data)
-
-        elif name == "get_user":
-            data = await tv_get(f"/users/{args['user_id']}")
-            return ok(data)
-
-        elif name == "update_user":
-            user_id = args.pop("user_id")
-            payload = {k: v for k, v in args.items() if v is not None}
-            data = await tv_put(f"/users/{user_id}", payload)
-            return ok(data)
-
-        # ── Sessions ─────────────────────────────────────────────────────────
-        elif name == "list_sessions":
-            params = {}
-            if args.get("groupid"):
-                params["groupid"] = args["groupid"]
-            if args.get("state"):
-                params["state"] = args["state"]
-            data = await tv_get("/sessions", params or None)
-            return ok(data)
-
-        elif name == "create_session":
-            payload = {k: v for k, v in args.items() if v is not None}
-            data = await tv_post("/sessions", payload)
-            return ok(data)
-
-        elif name == "get_session":
-            data = await tv_get(f"/sessions/{args['session_code']}")
-            return ok(data)
-
-        elif name == "update_session":
-            session_code = args.pop("session_code")
-            payload = {k: v for k, v in args.items() if v is not None}
-            data = await tv_put(f"/sessions/{session_code}", payload)
-            return ok(data)
-
-        elif name == "close_session":
-            data = await tv_put(
-                f"/sessions/{args['session_code']}",
-                {"state": "closed"},
+    handler = HANDLERS.get(name)
+    if handler is None:
+        return [
+            types.TextContent(
+                type="text",
+                text=to_json({"error": f"Unknown tool: {name}"}),
             )
-            return ok(data)
-
-        # ── Connection Reports ───────────────────────────────────────────────
-        elif name == "get_connection_reports":
-            params = {}
-            field_map = {
-                "from_date": "from",
-                "to_date": "to",
-                "device_id": "deviceid",
-                "user_id": "userid",
-                "session_code": "sessioncode",
-                "limit": "limit",
-                "offset": "offset",
-            }
-            for arg_key, param_key in field_map.items():
-                if args.get(arg_key) is not None:
-                    params[param_key] = args[arg_key]
-            data = await tv_get("/reports/connections", params or None)
-            return ok(data)
-
-        # ── Meetings ─────────────────────────────────────────────────────────
-        elif name == "list_meetings":
-            data = await tv_get("/meetings")
-            return ok(data)
-
-        elif name == "create_meeting":
-            payload = {k: v for k, v in args.items() if v is not None}
-            data = await tv_post("/meetings", payload)
-            return ok(data)
-
-        elif name == "get_meeting":
-            data = await tv_get(f"/meetings/{args['meeting_id']}")
-            return ok(data)
-
-        elif name == "update_meeting":
-            meeting_id = args.pop("meeting_id")
-            payload = {k: v for k, v in args.items() if v is not None}
-            data = await tv_put(f"/meetings/{meeting_id}", payload)
-            return ok(data)
-
-        elif name == "delete_meeting":
-            data = await tv_delete(f"/meetings/{args['meeting_id']}")
-            return ok(data)
-
-        # ── Policies ─────────────────────────────────────────────────────────
-        elif name == "list_policies":
-            data = await tv_get("/teamviewerpolicies")
-            return ok(data)
-
-        elif name == "get_policy":
-            data = await tv_get(f"/teamviewerpolicies/{args['policy_id']}")
-            return ok(data)
-
-        else:
-            return [
-                types.TextContent(
-                    type="text",
-                    text=json.dumps({"error": f"Unknown tool: {name}"}),
-                )
-            ]
+        ]
 
+    try:
+        data = await handler(args)
     except httpx.HTTPStatusError as exc:
-        error_body = exc.response.text
+        # Decode at most ERROR_DETAIL_LIMIT bytes so a huge error page
+        # doesn't dominate the cost of reporting it.
+        response = exc.response
+        error_body = response.content[:ERROR_DETAIL_LIMIT].decode(
+            response.encoding or "utf-8", "replace"
+        )
         return [
             types.TextContent(
                 type="text",
-                text=json.dumps(
+                text=to_json(
                     {
-                        "error": f"TeamViewer API error {exc.response.status_code}",
+                        "error": f"TeamViewer API error {response.status_code}",
                         "detail": error_body,
-                    },
-                    indent=2,
+                    }
                 ),
             )
         ]
@@ -730,9 +825,10 @@ async def handle_call_tool(
         return [
             types.TextContent(
                 type="text",
-                text=json.dumps({"error": str(exc)}, indent=2),
+                text=to_json({"error": str(exc)}),
             )
         ]
+    return ok(data)
 
 
 # ---------------------------------------------------------------------------
@@ -740,24 +836,31 @@ async def handle_call_tool(
 # ---------------------------------------------------------------------------
 
 async def run():
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="mcp-teamviewer",
-                server_version="0.1.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
+    try:
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="mcp-teamviewer",
+                    server_version="0.1.0",
+                    capabilities=server.get_capabilities(
+                        notification_options=NotificationOptions(),
+                        experimental_capabilities={},
+                    ),
                 ),
-            ),
-        )
+            )
+    finally:
+        await close_client()
 
 
 def main():
-    import asyncio
-    asyncio.run(run())
+    try:
+        import uvloop
+    except ImportError:  # not available on Windows
+        asyncio.run(run())
+    else:
+        uvloop.run(run())
 
 
 if __name__ == "__main__":